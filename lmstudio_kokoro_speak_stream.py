@@ -1,15 +1,18 @@
+import os
 import re
 import queue
 import threading
+from collections import deque
+import httpx
 import numpy as np
+import orjson
 import sounddevice as sd
 import torch
-from openai import OpenAI
 from kokoro import KModel, KPipeline
 
 # ---------- LM Studio (OpenAI-compatible) ----------
 LMSTUDIO_BASE_URL = "http://127.0.0.1:1234/v1"   # default :contentReference[oaicite:2]{index=2}
-LMSTUDIO_API_KEY = "lm-studio"                   # not actually required, but OpenAI client wants a string
+LMSTUDIO_API_KEY = "lm-studio"                   # not actually required, but sent as a bearer token
 
 MODEL_NAME = "nous-capybara-34b"  # e.g. what LM Studio shows in the Local Server tab
 
@@ -18,66 +21,119 @@ KOKORO_REPO_ID = "hexgrad/Kokoro-82M"
 KOKORO_LANG = "a"      # English
 KOKORO_VOICE = "af_nicole"
 SAMPLE_RATE = 24000
+KOKORO_BF16 = os.getenv("KOKORO_BF16", "0") == "1"  # experimental bfloat16 autocast on CUDA
 
-# Chunk speech at sentence-ish boundaries
-SENT_END_RE = re.compile(r"([.!?]+|\n)")
+# Chunk speech at sentence-ish boundaries, or at clause boundaries in long sentences
+SENT_END_RE = re.compile(r"[.!?]+|\n|[,;:](?=\s)")
+SENT_END_CHARS = frozenset(".!?\n,;:")
+CLAUSE_END_CHARS = ",;:"
+MIN_CHUNK_CHARS = 40   # shorter sentences are merged with the next one to avoid choppy pauses
+MIN_CLAUSE_CHARS = 60  # only break at , ; : once the pending text is at least this long
 
-def split_into_speakable_chunks(buffer: str):
+def split_into_speakable_chunks(buffer: str, scan_pos: int = 0):
     """
-    Return (chunks_to_speak, remainder).
-    Speaks complete sentences / lines; keeps remainder for later.
+    Return (chunks_to_speak, remainder, scan_pos).
+    Speaks complete sentences / lines, and clauses of long sentences; keeps
+    remainder for later.
+    Only buffer[scan_pos:] is searched, so pass back the returned scan_pos
+    after appending new text to avoid rescanning what was already seen.
     """
-    parts = SENT_END_RE.split(buffer)
+    # Most tokens contain no ender; a set check skips the regex for them
+    if SENT_END_CHARS.isdisjoint(buffer[scan_pos:]):
+        return [], buffer, len(buffer)
+
     chunks = []
-    cur = ""
-    for i in range(0, len(parts) - 1, 2):
-        text_part = parts[i]
-        ender = parts[i + 1]
-        cur += text_part + ender
-        if cur.strip():
-            chunks.append(cur.strip())
-        cur = ""
+    start = 0
+    pos = scan_pos
+    while True:
+        m = SENT_END_RE.search(buffer, pos)
+        if m is None:
+            break
+        pos = m.end()
+        candidate = buffer[start:pos].strip()
+        min_chars = MIN_CLAUSE_CHARS if m.group() in CLAUSE_END_CHARS else MIN_CHUNK_CHARS
+        if len(candidate) >= min_chars:
+            chunks.append(candidate)
+            start = pos
+
+    remainder = buffer[start:]  # trailing partial (or too short) sentence
+    # Back up one character: a trailing comma only counts once whitespace follows it
+    return chunks, remainder, max(len(remainder) - 1, 0)
 
-    remainder = ""
-    if len(parts) % 2 == 1:
-        remainder = parts[-1]  # trailing partial sentence
-    return chunks, remainder
+
+def stream_chat_tokens(client: httpx.Client, messages):
+    """
+    Yield content tokens from LM Studio's streaming chat completions endpoint.
+    Parses the SSE lines directly instead of building an SDK object per event.
+    """
+    body = {
+        "model": MODEL_NAME,
+        "messages": messages,
+        "stream": True,
+        "temperature": 0.7,
+    }
+    with client.stream("POST", "/chat/completions", json=body) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line.startswith("data: "):
+                continue
+            payload = line[6:]
+            if payload == "[DONE]":
+                break
+            choices = orjson.loads(payload).get("choices") or []
+            if choices:
+                token = (choices[0].get("delta") or {}).get("content")
+                if token:
+                    yield token
 
 
 def main():
     # 1) Init Kokoro
     device = "cuda" if torch.cuda.is_available() else "cpu"
+    use_bf16 = KOKORO_BF16 and device == "cuda" and torch.cuda.is_bf16_supported()
     model = KModel(repo_id=KOKORO_REPO_ID).to(device).eval()
     pipeline = KPipeline(lang_code=KOKORO_LANG, repo_id=KOKORO_REPO_ID, model=model)
 
-    # 2) Audio playback worker (plays chunks sequentially)
-    audio_q: queue.Queue[np.ndarray | None] = queue.Queue()
-
-    def audio_player():
-        while True:
-            audio = audio_q.get()
-            if audio is None:
-                break
-            # Ensure mono float32
-            audio = np.asarray(audio, dtype=np.float32)
-            sd.play(audio, SAMPLE_RATE, blocking=True)
-
-    t_player = threading.Thread(target=audio_player, daemon=True)
-    t_player.start()
+    # 2) Audio playback: one output stream fed from a queue of chunks, so the next
+    #    chunk starts on the very next sample instead of after a device restart
+    pending: deque[np.ndarray] = deque()
+
+    def fill_output(outdata, frames, time_info, status):
+        filled = 0
+        while filled < frames and pending:
+            head = pending[0]
+            n = min(frames - filled, head.size)
+            outdata[filled:filled + n, 0] = head[:n]
+            if n == head.size:
+                pending.popleft()
+            else:
+                pending[0] = head[n:]
+            filled += n
+        outdata[filled:] = 0
+
+    stream = sd.OutputStream(
+        samplerate=SAMPLE_RATE, channels=1, dtype="float32", callback=fill_output
+    )
+    stream.start()
 
     # 3) TTS worker (text -> audio -> queue)
     tts_q: queue.Queue[str | None] = queue.Queue()
 
     def tts_worker():
+        # Load the voice pack once instead of resolving it for every chunk
+        voice_pack = pipeline.load_voice(KOKORO_VOICE)
         while True:
             text = tts_q.get()
             if text is None:
-                audio_q.put(None)
                 break
             # Generate audio for this chunk
             try:
-                out = next(pipeline(text, voice=KOKORO_VOICE))
-                audio_q.put(out.audio)
+                with torch.inference_mode(), torch.autocast(
+                    device_type=device, dtype=torch.bfloat16, enabled=use_bf16
+                ):
+                    out = next(pipeline(text, voice=voice_pack))
+                # Ensure mono float32
+                pending.append(np.asarray(out.audio.float(), dtype=np.float32).reshape(-1))
             except Exception as e:
                 print(f"\n[TTS error] {e}\n")
 
@@ -85,7 +141,11 @@ def main():
     t_tts.start()
 
     # 4) Chat loop
-    client = OpenAI(base_url=LMSTUDIO_BASE_URL, api_key=LMSTUDIO_API_KEY)
+    client = httpx.Client(
+        base_url=LMSTUDIO_BASE_URL,
+        headers={"Authorization": f"Bearer {LMSTUDIO_API_KEY}"},
+        timeout=httpx.Timeout(10.0, read=None),  # tokens may pause while the model thinks
+    )
 
     messages = []
     print("Type a prompt. Ctrl+C to exit.\n")
@@ -99,27 +159,18 @@ def main():
         print("Assistant: ", end="", flush=True)
 
         buffer = ""
+        scan_pos = 0
         try:
-            stream = client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=messages,
-                stream=True,
-                temperature=0.7,
-            )
-
             full = ""
-            for event in stream:
-                delta = event.choices[0].delta
-                if delta and delta.content:
-                    token = delta.content
-                    print(token, end="", flush=True)
-                    full += token
-                    buffer += token
-
-                    # Speak sentences as soon as they complete
-                    chunks, buffer = split_into_speakable_chunks(buffer)
-                    for c in chunks:
-                        tts_q.put(c)
+            for token in stream_chat_tokens(client, messages):
+                print(token, end="", flush=True)
+                full += token
+                buffer += token
+
+                # Speak sentences as soon as they complete
+                chunks, buffer, scan_pos = split_into_speakable_chunks(buffer, scan_pos)
+                for c in chunks:
+                    tts_q.put(c)
 
             print("\n")
             messages.append({"role": "assistant", "content": full})
@@ -134,8 +185,10 @@ def main():
             print(f"\n[LLM error] {e}\n")
 
     # shutdown
+    client.close()
     tts_q.put(None)
     t_tts.join(timeout=2)
+    stream.close()
 
 if __name__ == "__main__":
     main()
@@ -1,16 +1,26 @@
 import base64
-import io
+import functools
+import hashlib
 import os
+import pickle
+import queue
 import re
+import struct
 import threading
 import time
-import wave
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import httpx
 import numpy as np
+import orjson
 import torch
-from flask import Flask, jsonify, request
+from numba import njit
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence, pad_sequence
+from flask import Flask, Response, jsonify, request, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from kokoro import KModel, KPipeline
 from openai import OpenAI
@@ -23,9 +33,16 @@ LMSTUDIO_MODEL_NAME = os.getenv("LMSTUDIO_MODEL_NAME")  # None => auto-detect
 KOKORO_REPO_ID = os.getenv("KOKORO_REPO_ID", "hexgrad/Kokoro-82M")
 KOKORO_DEFAULT_LANG = os.getenv("KOKORO_LANG", "a")
 SAMPLE_RATE = int(os.getenv("KOKORO_SAMPLE_RATE", "24000"))
+TTS_MAX_BATCH = max(1, int(os.getenv("KOKORO_MAX_BATCH", "8")))
+KOKORO_BF16 = os.getenv("KOKORO_BF16", "0") == "1"
+KOKORO_COMPILE = os.getenv("KOKORO_COMPILE", "0") == "1"
+KOKORO_CPU_QUANTIZE = os.getenv("KOKORO_CPU_QUANTIZE", "0") == "1"
 VOICES_PATH = Path(__file__).with_name("VOICES.md")
+VOICES_CACHE_PATH = VOICES_PATH.with_name("voices.pkl")
 
 STATIC_DIR = os.path.join(os.path.dirname(__file__), "web")
+INDEX_PATH = Path(STATIC_DIR) / "index.html"
+INDEX_RECHECK_SECONDS = 5.0
 
 
 def _parse_voice_catalog(path: Path, fallback_lang: str) -> Dict[str, Dict[str, str]]:
@@ -80,20 +97,87 @@ def _parse_voice_catalog(path: Path, fallback_lang: str) -> Dict[str, Dict[str,
     return voices
 
 
+def _load_voice_catalog(
+    path: Path, cache_path: Path, fallback_lang: str
+) -> Dict[str, Dict[str, str]]:
+    """Load the parsed catalog from its pickle, reparsing when the markdown is newer."""
+    try:
+        if cache_path.stat().st_mtime >= path.stat().st_mtime:
+            with cache_path.open("rb") as handle:
+                cached = pickle.load(handle)
+            if cached["lang"] == fallback_lang:
+                return cached["voices"]
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError, TypeError):
+        pass
+
+    voices = _parse_voice_catalog(path, fallback_lang)
+    if voices:
+        tmp_path = cache_path.with_suffix(".tmp")
+        try:
+            with tmp_path.open("wb") as handle:
+                pickle.dump({"voices": voices, "lang": fallback_lang}, handle)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return voices
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, which encodes the large base64 audio strings much faster."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
 # ---------- App + Clients ----------
 app = Flask(__name__, static_folder=STATIC_DIR, static_url_path="")
+app.json = OrjsonProvider(app)
 CORS(app)
 
 client = OpenAI(base_url=LMSTUDIO_BASE_URL, api_key=LMSTUDIO_API_KEY)
+http_client = httpx.Client(
+    base_url=LMSTUDIO_BASE_URL,
+    headers={"Authorization": f"Bearer {LMSTUDIO_API_KEY}"},
+    timeout=10.0,
+)
 
 device = "cuda" if torch.cuda.is_available() else "cpu"
 kokoro_model = KModel(repo_id=KOKORO_REPO_ID).to(device).eval()
-tts_lock = threading.Lock()
+if KOKORO_CPU_QUANTIZE and device == "cpu":
+    # Linear matmuls are memory-bound on CPU; int8 weights cut that traffic 4x. LSTMs stay
+    # fp32: Kokoro's encoders call flatten_parameters(), which quantized LSTMs lack.
+    kokoro_model = torch.ao.quantization.quantize_dynamic(
+        kokoro_model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+use_bf16 = KOKORO_BF16 and device == "cuda" and torch.cuda.is_bf16_supported()
+if KOKORO_COMPILE and device == "cuda":
+    # The decoder dominates runtime; batch and sequence lengths vary, so compile dynamically.
+    kokoro_model.decoder = torch.compile(kokoro_model.decoder, dynamic=True)
 pipelines: Dict[str, KPipeline] = {}
-_model_cache: dict[str, float | List[str]] = {"ts": 0.0, "models": []}
+pipelines_lock = threading.Lock()
+g2p_locks: Dict[str, threading.Lock] = {}
+voice_pack_cache: Dict[str, torch.Tensor] = {}
+# Jobs are (phonemes, style vector, future); futures resolve to (host audio, CUDA event or None).
+_synth_queue: "queue.Queue[Tuple[str, torch.Tensor, Future]]" = queue.Queue()
+# Values are (WAV bytes, voice); base64 is added only where JSON needs it.
+synthesis_cache: "OrderedDict[bytes, Tuple[bytes, str]]" = OrderedDict()
+synthesis_cache_lock = threading.Lock()
+synthesis_cache_bytes = 0
+SYNTHESIS_CACHE_MAX_ENTRIES = 256
+SYNTHESIS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SYNTHESIS_CACHE_MAX_TEXT = 512  # characters; longer texts are rarely repeated
+_model_cache: dict[str, float | List[str] | Optional[str]] = {"ts": 0.0, "models": [], "etag": None}
 MODEL_CACHE_TTL = 30.0  # seconds
+_index_cache: dict[str, float | bytes | str] = {"html": b"", "mtime": 0.0, "etag": "", "checked": 0.0}
 
-voice_catalog = _parse_voice_catalog(VOICES_PATH, KOKORO_DEFAULT_LANG)
+voice_catalog = _load_voice_catalog(VOICES_PATH, VOICES_CACHE_PATH, KOKORO_DEFAULT_LANG)
 PREFERRED_DEFAULT_VOICE = "af_nicole"
 env_default_voice = os.getenv("KOKORO_VOICE")
 if env_default_voice and env_default_voice in voice_catalog:
@@ -115,60 +199,389 @@ def get_voice_info(requested: Optional[str]) -> tuple[str, str]:
 
 
 def get_pipeline(lang_code: str) -> KPipeline:
+    """Return the text-only pipeline for a language; inference happens in the batcher."""
     pipeline = pipelines.get(lang_code)
     if pipeline is None:
-        pipeline = KPipeline(
-            lang_code=lang_code, repo_id=KOKORO_REPO_ID, model=kokoro_model
-        )
-        pipelines[lang_code] = pipeline
+        with pipelines_lock:
+            pipeline = pipelines.get(lang_code)
+            if pipeline is None:
+                pipeline = KPipeline(lang_code=lang_code, repo_id=KOKORO_REPO_ID, model=False)
+                pipelines[lang_code] = pipeline
     return pipeline
 
 
-def _audio_to_wav_base64(audio: np.ndarray) -> str:
-    """Convert Kokoro float audio to base64 wav bytes."""
-    if isinstance(audio, torch.Tensor):
-        audio = audio.detach().cpu().numpy()
-    arr = np.asarray(audio, dtype=np.float32).flatten()
-    arr = np.clip(arr, -1.0, 1.0)
-    pcm = (arr * 32767.0).astype(np.int16)
+def get_voice_pack(pipeline: KPipeline, voice: str) -> torch.Tensor:
+    """Return the style vectors for a voice, loaded once and kept on the model device."""
+    pack = voice_pack_cache.get(voice)
+    if pack is None:
+        pack = pipeline.load_voice(voice).to(device)
+        voice_pack_cache[voice] = pack
+    return pack
+
+
+@functools.lru_cache(maxsize=512)
+def _phonemize(lang_code: str, text: str) -> Tuple[str, ...]:
+    """Run g2p and Kokoro's own chunking, returning phoneme strings ready for the model."""
+    pipeline = get_pipeline(lang_code)
+    # misaki/spaCy and the espeak ctypes backend keep global state; serialize g2p per language.
+    with pipelines_lock:
+        lock = g2p_locks.setdefault(lang_code, threading.Lock())
+    with lock:
+        return tuple(result.phonemes for result in pipeline(text) if result.phonemes)
+
+
+def _token_ids(phonemes: str) -> torch.Tensor:
+    """Map phonemes to Kokoro token ids with boundary tokens, as ``KModel.forward`` does."""
+    vocab = kokoro_model.vocab
+    return torch.LongTensor([0, *(vocab[p] for p in phonemes if p in vocab), 0])
+
+
+def _align_batch(
+    phonemes: List[str], ref_s: torch.Tensor
+) -> List[Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]:
+    """Run Kokoro's token-level stages for several phoneme sequences in one padded pass.
+
+    BERT is masked and every LSTM here runs on packed sequences, so each item
+    sees exactly what an unbatched pass would. F0/energy prediction normalizes
+    over time (AdaIN), so it runs per item on unpadded frames. Returns the
+    decoder inputs ``(asr, F0_pred, N_pred)`` for each item.
+    """
+    ids = [_token_ids(ps) for ps in phonemes]
+    lengths = [t.numel() for t in ids]
+    input_lengths = torch.tensor(lengths, device=device)
+    input_ids = pad_sequence(ids, batch_first=True).to(device)
+    max_len = input_ids.shape[1]
+    text_mask = torch.arange(max_len, device=device).unsqueeze(0) >= input_lengths.unsqueeze(1)
+
+    bert_dur = kokoro_model.bert(input_ids, attention_mask=(~text_mask).int())
+    d_en = kokoro_model.bert_encoder(bert_dur).transpose(-1, -2)
+    s = ref_s[:, 128:]
+    d = kokoro_model.predictor.text_encoder(d_en, s, input_lengths, text_mask)
+    packed = pack_padded_sequence(d, input_lengths.cpu(), batch_first=True, enforce_sorted=False)
+    x, _ = kokoro_model.predictor.lstm(packed)
+    x, _ = pad_packed_sequence(x, batch_first=True, total_length=max_len)
+    duration = torch.sigmoid(kokoro_model.predictor.duration_proj(x)).sum(dim=-1)
+    pred_dur = torch.round(duration).clamp(min=1).long()
+    t_en = kokoro_model.text_encoder(input_ids, input_lengths, text_mask)
+
+    aligned = []
+    for i, n in enumerate(lengths):
+        indices = torch.repeat_interleave(torch.arange(n, device=device), pred_dur[i, :n])
+        pred_aln_trg = torch.zeros((n, indices.shape[0]), device=device)
+        pred_aln_trg[indices, torch.arange(indices.shape[0], device=device)] = 1
+        pred_aln_trg = pred_aln_trg.unsqueeze(0)
+        en = d[i : i + 1, :n].transpose(-1, -2) @ pred_aln_trg
+        F0_pred, N_pred = kokoro_model.predictor.F0Ntrain(en, s[i : i + 1])
+        asr = t_en[i : i + 1, :, :n] @ pred_aln_trg
+        aligned.append((asr, F0_pred, N_pred))
+    return aligned
+
+
+def _decode(
+    asr: torch.Tensor, F0_pred: torch.Tensor, N_pred: torch.Tensor, ref_s: torch.Tensor
+) -> torch.Tensor:
+    """Decode one item's aligned features to float32 audio.
+
+    Always runs in fp32: the decoder's harmonic source goes through
+    ``torch.stft``, which has no bfloat16 kernel.
+    """
+    with torch.autocast(device_type=device, enabled=False):
+        return kokoro_model.decoder(
+            asr.float(), F0_pred.float(), N_pred.float(), ref_s[:, :128].float()
+        ).squeeze().float()
+
+
+@torch.inference_mode()
+def _forward_batch(phonemes: List[str], ref_s: torch.Tensor) -> List[torch.Tensor]:
+    """Synthesize several phoneme sequences, batching the token-level stages.
+
+    The decoder also normalizes over time, so it runs once per item; padded
+    frames never reach it and each output matches ``KModel.forward_with_tokens``.
+    Only the token-level stages run under bfloat16 autocast, when enabled.
+    """
+    if len(phonemes) == 1:
+        # forward_with_tokens, unlike KModel.forward, leaves the audio on the device
+        # so the batcher's non-blocking host copy applies to single jobs too. It
+        # includes the decoder, so it stays in fp32.
+        audio, _ = kokoro_model.forward_with_tokens(
+            _token_ids(phonemes[0]).unsqueeze(0).to(device), ref_s
+        )
+        return [audio.float()]
+
+    with torch.autocast(device_type=device, dtype=torch.bfloat16, enabled=use_bf16):
+        aligned = _align_batch(phonemes, ref_s)
+    return [
+        _decode(asr, F0_pred, N_pred, ref_s[i : i + 1])
+        for i, (asr, F0_pred, N_pred) in enumerate(aligned)
+    ]
+
+
+def _check_batch_parity() -> bool:
+    """Compare a padded two-sentence batch against Kokoro's own unbatched forward.
 
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(SAMPLE_RATE)
-        wf.writeframes(pcm.tobytes())
+    The decoder draws random noise, so both sides are seeded identically.
+    """
+    voice, lang_code = get_voice_info(None)
+    pack = get_voice_pack(get_pipeline(lang_code), voice)
+    phonemes = [
+        ps
+        for text in ("Hi there.", "This sentence is quite a bit longer than the first one.")
+        for ps in _phonemize(lang_code, text)
+    ]
+    ref_s = torch.stack([pack[len(ps) - 1] for ps in phonemes]).squeeze(1)
+    tolerance = 1e-2 if use_bf16 else 1e-3
+    with torch.inference_mode():
+        with torch.autocast(device_type=device, dtype=torch.bfloat16, enabled=use_bf16):
+            aligned = _align_batch(phonemes, ref_s)
+        for i, (ps, (asr, F0_pred, N_pred)) in enumerate(zip(phonemes, aligned)):
+            torch.manual_seed(0)
+            expected, _ = kokoro_model.forward_with_tokens(
+                _token_ids(ps).unsqueeze(0).to(device), ref_s[i : i + 1]
+            )
+            torch.manual_seed(0)
+            actual = _decode(asr, F0_pred, N_pred, ref_s[i : i + 1])
+            expected = expected.float()
+            if actual.shape != expected.shape or not torch.allclose(
+                actual, expected, atol=tolerance, rtol=tolerance
+            ):
+                return False
+    return True
+
+
+def _synthesis_worker() -> None:
+    """Drain queued phoneme chunks and synthesize them in batches of up to ``batch_size``.
+
+    Only the model forward runs here. On CUDA the results are copied into
+    pinned host memory without blocking and handed over with an event to wait
+    on, so the next batch starts while the copies are in flight; any numpy
+    post-processing happens on the requesting thread.
+    """
+    while True:
+        jobs = [_synth_queue.get()]
+        while len(jobs) < batch_size:
+            try:
+                jobs.append(_synth_queue.get_nowait())
+            except queue.Empty:
+                break
 
-    return base64.b64encode(buf.getvalue()).decode("ascii")
+        try:
+            ref_s = torch.stack([ref for _, ref, _ in jobs]).squeeze(1).to(device)
+            outputs = _forward_batch([ps for ps, _, _ in jobs], ref_s)
+            copied = torch.cuda.Event() if device == "cuda" else None
+            hosts: List[torch.Tensor] = []
+            for audio in outputs:
+                if copied is None:
+                    hosts.append(audio.detach())
+                    continue
+                host = torch.empty(audio.shape, dtype=audio.dtype, pin_memory=True)
+                host.copy_(audio, non_blocking=True)
+                hosts.append(host)
+            if copied is not None:
+                copied.record()
+            for (_, _, future), host in zip(jobs, hosts):
+                future.set_result((host, copied))
+        except Exception as exc:  # pragma: no cover - surfaced to every waiting request
+            for _, _, future in jobs:
+                if not future.done():
+                    future.set_exception(exc)
+
+
+def _schedule_synthesis(lang_code: str, text: str, voice: str) -> List[Future]:
+    """Queue every phoneme chunk of ``text`` for the batcher, in order.
+
+    Chunking is left to Kokoro's pipeline, so the audio matches an unbatched
+    run; concurrent requests are what the batcher groups together.
+    """
+    pack = get_voice_pack(get_pipeline(lang_code), voice)
+    futures: List[Future] = []
+    for ps in _phonemize(lang_code, text):
+        future: Future = Future()
+        _synth_queue.put((ps, pack[len(ps) - 1], future))
+        futures.append(future)
+    return futures
+
+
+def _chunk_to_numpy(future: Future) -> np.ndarray:
+    """Wait for one synthesized chunk and return it as flat float32 host audio."""
+    audio, copied = future.result()
+    if copied is not None:
+        copied.synchronize()
+    return audio.numpy().reshape(-1)
+
+
+@njit(cache=True, fastmath=True)
+def _fp32_to_pcm16(src, dst):
+    # Clip, scale, round and cast in a single pass over the samples. Deliberately
+    # serial: request threads call this concurrently, and numba's parallel
+    # workqueue layer aborts the process on concurrent use.
+    for i in range(src.size):
+        v = src[i]
+        if v > 1.0:
+            v = 1.0
+        elif v < -1.0:
+            v = -1.0
+        dst[i] = round(v * 32767.0)
+
+
+def _to_pcm16(arr: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Convert float audio in [-1, 1] to 16-bit PCM in ``out``."""
+    _fp32_to_pcm16(arr, out)
+    return out
+
+
+# Compile the kernel at startup rather than on the first request.
+_to_pcm16(np.zeros(1024, dtype=np.float32), np.empty(1024, dtype=np.int16))
+
+
+# 16-bit mono PCM header; the RIFF/data sizes are left open for streamed audio.
+_WAV_HEADER = struct.pack(
+    "<4sI4s4sIHHIIHH4sI",
+    b"RIFF", 0xFFFFFFFF, b"WAVE",
+    b"fmt ", 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16,
+    b"data", 0xFFFFFFFF,
+)
+
+
+def _wav_header(data_size: int) -> bytes:
+    """Return the WAV header for ``data_size`` bytes of PCM."""
+    header = bytearray(_WAV_HEADER)
+    struct.pack_into("<I", header, 4, 36 + data_size)
+    struct.pack_into("<I", header, 40, data_size)
+    return bytes(header)
+
+
+class Int16Pool:
+    """Reusable int16 buffers, bucketed in one-second grains of audio.
+
+    Each buffer reserves ``reserve`` leading samples so a WAV header can be
+    written in front of the PCM without another copy. At most ``max_bytes``
+    are held across all buckets; buffers beyond that are left to the GC.
+    """
+
+    def __init__(
+        self, grain: int, reserve: int = 0, max_per_bucket: int = 4, max_bytes: int = 32 * 1024 * 1024
+    ) -> None:
+        self._pools: Dict[int, List[np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._grain = grain
+        self._reserve = reserve
+        self._max_per_bucket = max_per_bucket
+        self._max_bytes = max_bytes
+        self._pooled_bytes = 0
+
+    def acquire(self, size: int) -> np.ndarray:
+        """Return a buffer with room for ``reserve + size`` samples."""
+        bucket = max(1, -(-size // self._grain)) * self._grain
+        with self._lock:
+            free = self._pools.get(bucket)
+            if free:
+                buf = free.pop()
+                self._pooled_bytes -= buf.nbytes
+                return buf
+        return np.empty(self._reserve + bucket, dtype=np.int16)
+
+    def release(self, buf: np.ndarray) -> None:
+        """Hand a buffer from ``acquire`` back to the pool."""
+        bucket = buf.size - self._reserve
+        with self._lock:
+            if self._pooled_bytes + buf.nbytes > self._max_bytes:
+                return
+            free = self._pools.setdefault(bucket, [])
+            if len(free) < self._max_per_bucket:
+                free.append(buf)
+                self._pooled_bytes += buf.nbytes
+
+
+_WAV_HEADER_SAMPLES = len(_WAV_HEADER) // 2
+PCM_POOL = Int16Pool(grain=SAMPLE_RATE, reserve=_WAV_HEADER_SAMPLES)
+
+
+def _audio_to_wav(audio: np.ndarray) -> bytes:
+    """Convert Kokoro float audio to 16-bit mono wav bytes."""
+    if isinstance(audio, torch.Tensor):
+        audio = audio.detach().cpu().numpy()
+    arr = np.ascontiguousarray(audio, dtype=np.float32).ravel()
+    buf = PCM_POOL.acquire(arr.size)
+    try:
+        wav = buf[: _WAV_HEADER_SAMPLES + arr.size]
+        wav[:_WAV_HEADER_SAMPLES].view(np.uint8)[:] = np.frombuffer(
+            _wav_header(arr.size * 2), dtype=np.uint8
+        )
+        _to_pcm16(arr, wav[_WAV_HEADER_SAMPLES:])
+        return wav.tobytes()
+    finally:
+        PCM_POOL.release(buf)
+
+
+def _synthesis_cache_key(text: str, voice: str) -> Optional[bytes]:
+    """Key for ``synthesis_cache``, or None when the text is too long to be worth caching."""
+    if len(text) > SYNTHESIS_CACHE_MAX_TEXT:
+        return None
+    return hashlib.blake2b(f"{text}|{voice}".encode("utf-8"), digest_size=16).digest()
+
+
+def _synthesis_cache_get(key: Optional[bytes]) -> Optional[Tuple[bytes, str]]:
+    if key is None:
+        return None
+    with synthesis_cache_lock:
+        cached = synthesis_cache.get(key)
+        if cached is not None:
+            synthesis_cache.move_to_end(key)
+        return cached
+
+
+def _synthesis_cache_put(key: Optional[bytes], result: Tuple[bytes, str]) -> None:
+    """Store a result, evicting least recently used entries past either cap."""
+    global synthesis_cache_bytes
+    if key is None or len(result[0]) > SYNTHESIS_CACHE_MAX_BYTES:
+        return
+    with synthesis_cache_lock:
+        previous = synthesis_cache.pop(key, None)
+        if previous is not None:
+            synthesis_cache_bytes -= len(previous[0])
+        synthesis_cache[key] = result
+        synthesis_cache_bytes += len(result[0])
+        while (
+            len(synthesis_cache) > SYNTHESIS_CACHE_MAX_ENTRIES
+            or synthesis_cache_bytes > SYNTHESIS_CACHE_MAX_BYTES
+        ):
+            _, (evicted, _) = synthesis_cache.popitem(last=False)
+            synthesis_cache_bytes -= len(evicted)
 
 
 def synthesize_audio(
     text: str, voice_name: Optional[str] = None
-) -> Tuple[str, str]:
+) -> Tuple[bytes, str]:
     resolved_voice, lang_code = get_voice_info(voice_name)
 
     clean_text = (text or "").strip()
     if not clean_text:
         raise ValueError("No text provided to synthesize.")
 
+    cache_key = _synthesis_cache_key(clean_text, resolved_voice)
+    cached = _synthesis_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     last_error: Optional[Exception] = None
     for attempt in (0, 1):
-        pipeline = get_pipeline(lang_code)
-
         try:
-            with tts_lock:
-                segments: List[np.ndarray] = []
-                for chunk in pipeline(clean_text, voice=resolved_voice):
-                    audio = chunk.audio
-                    if isinstance(audio, torch.Tensor):
-                        audio = audio.detach().cpu().numpy()
-                    arr = np.asarray(audio, dtype=np.float32).flatten()
-                    if arr.size:
-                        segments.append(arr)
-                if not segments:
-                    raise RuntimeError("Kokoro returned empty audio.")
-                audio = np.concatenate(segments)
-            return _audio_to_wav_base64(audio), resolved_voice
+            # Write chunks straight into one buffer sized from the text (~50ms per
+            # character), growing only if the estimate falls short.
+            audio = np.empty(max(SAMPLE_RATE, len(clean_text) * 1200), dtype=np.float32)
+            pos = 0
+            for future in _schedule_synthesis(lang_code, clean_text, resolved_voice):
+                chunk = _chunk_to_numpy(future)
+                need = pos + chunk.size
+                if need > audio.size:
+                    audio = np.resize(audio, need * 2)
+                audio[pos:need] = chunk
+                pos = need
+            if not pos:
+                raise RuntimeError("Kokoro returned empty audio.")
+            result = (_audio_to_wav(audio[:pos]), resolved_voice)
+            _synthesis_cache_put(cache_key, result)
+            return result
         except Exception as exc:  # pragma: no cover - safety net for runtime TTS failures
             last_error = exc
             # Reset the cached pipeline in case it got into a bad state for this language.
@@ -184,16 +597,41 @@ def synthesize_audio(
     ) from last_error
 
 
-def _fetch_lmstudio_models() -> List[str]:
-    """Query LM Studio for available model IDs."""
+batch_size = TTS_MAX_BATCH
+if batch_size > 1:
     try:
-        response = client.models.list()
+        batch_parity_ok = _check_batch_parity()
+    except Exception as exc:  # pragma: no cover - depends on local model/voice setup
+        app.logger.warning("Kokoro batch parity check failed to run: %s", exc)
+        batch_parity_ok = False
+    if not batch_parity_ok:
+        app.logger.warning(
+            "Batched Kokoro output differs from unbatched output; synthesizing one chunk at a time."
+        )
+        batch_size = 1
+
+threading.Thread(target=_synthesis_worker, name="kokoro-batcher", daemon=True).start()
+
+
+def _fetch_lmstudio_models(etag: Optional[str] = None) -> Tuple[Optional[List[str]], Optional[str]]:
+    """Query LM Studio for available model IDs.
+
+    Sends ``etag`` as If-None-Match; returns ``(None, etag)`` when LM Studio
+    answers 304 Not Modified, otherwise the model IDs and the new ETag.
+    """
+    headers = {"If-None-Match": etag} if etag else {}
+    try:
+        response = http_client.get("/models", headers=headers)
+        if response.status_code == 304:
+            return None, etag
+        response.raise_for_status()
+        data = response.json().get("data") or []
     except Exception as exc:
         app.logger.warning("Failed to fetch LM Studio models: %s", exc)
-        return []
+        return [], etag
 
-    data = getattr(response, "data", []) or []
-    return [getattr(model, "id", "") for model in data if getattr(model, "id", "")]
+    models = [model.get("id", "") for model in data if model.get("id")]
+    return models, response.headers.get("ETag")
 
 
 def available_models(force_refresh: bool = False) -> List[str]:
@@ -207,10 +645,15 @@ def available_models(force_refresh: bool = False) -> List[str]:
     if not force_refresh and cached and now - ts < MODEL_CACHE_TTL:
         return cached  # type: ignore[return-value]
 
-    models = _fetch_lmstudio_models()
+    etag = _model_cache["etag"] if cached else None
+    models, etag = _fetch_lmstudio_models(etag)  # type: ignore[arg-type]
+    if models is None:
+        _model_cache["ts"] = now
+        return cached  # type: ignore[return-value]
     if models:
         _model_cache["models"] = models
         _model_cache["ts"] = now
+        _model_cache["etag"] = etag
         return models
 
     return cached or []  # type: ignore[return-value]
@@ -257,36 +700,88 @@ def chat():
         return jsonify({"error": str(exc)}), 500
 
     try:
-        audio_b64, resolved_voice = synthesize_audio(content, resolved_voice)
+        wav, resolved_voice = synthesize_audio(content, resolved_voice)
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
     except Exception as exc:
         return jsonify({"error": str(exc)}), 500
 
     return jsonify(
-        {"content": content, "audio": audio_b64, "model": model_name, "voice": resolved_voice}
+        {
+            "content": content,
+            "audio": base64.b64encode(wav).decode("ascii"),
+            "model": model_name,
+            "voice": resolved_voice,
+        }
     )
 
 
 @app.route("/api/tts", methods=["POST"])
 def tts():
+    """Stream 16-bit mono WAV audio, one Kokoro chunk at a time.
+
+    If synthesis fails after the headers are sent, the response is aborted
+    rather than ended cleanly, so the client can tell the audio is incomplete.
+    """
     payload = request.get_json(force=True) or {}
-    text = payload.get("text", "")
+    text = (payload.get("text") or "").strip()
     voice = payload.get("voice")
 
     try:
-        audio_b64, resolved_voice = synthesize_audio(text, voice)
+        resolved_voice, lang_code = get_voice_info(voice)
+        if not text:
+            raise ValueError("No text provided to synthesize.")
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
-    except Exception as exc:
-        return jsonify({"error": str(exc)}), 500
 
-    return jsonify({"audio": audio_b64, "voice": resolved_voice})
+    cache_key = _synthesis_cache_key(text, resolved_voice)
+    cached = _synthesis_cache_get(cache_key)
+    if cached is not None:
+        response = Response(cached[0], mimetype="audio/wav")
+        response.headers["X-Voice"] = resolved_voice
+        return response
+
+    for attempt in (0, 1):
+        try:
+            futures = _schedule_synthesis(lang_code, text, resolved_voice)
+            break
+        except Exception as exc:
+            # Reset the cached pipeline in case it got into a bad state for this language.
+            pipelines.pop(lang_code, None)
+            if attempt == 0:
+                continue
+            app.logger.error("TTS failed for voice '%s': %s", resolved_voice, exc)
+            return jsonify({"error": f"TTS failed for voice '{resolved_voice}': {exc}"}), 500
+    if not futures:
+        return jsonify({"error": "Kokoro returned empty audio."}), 500
+
+    def generate():
+        yield _WAV_HEADER
+        parts: List[bytes] = []
+        for future in futures:
+            try:
+                arr = _chunk_to_numpy(future)
+            except Exception as exc:  # pragma: no cover - headers are already sent
+                error_msg = f"TTS failed for voice '{resolved_voice}': {exc}"
+                app.logger.error(error_msg)
+                raise RuntimeError(error_msg) from exc
+            chunk = _to_pcm16(arr, np.empty(arr.size, dtype=np.int16)).tobytes()
+            if cache_key is not None:
+                parts.append(chunk)
+            yield chunk
+
+        if cache_key is not None:
+            data = b"".join(parts)
+            _synthesis_cache_put(cache_key, (_wav_header(len(data)) + data, resolved_voice))
+
+    response = Response(stream_with_context(generate()), mimetype="audio/wav")
+    response.headers["X-Voice"] = resolved_voice
+    return response
 
 
 @app.route("/api/models", methods=["GET"])
 def list_models():
-    models = available_models(force_refresh=True)
+    models = available_models(force_refresh=request.args.get("refresh") == "1")
     return jsonify({"models": models})
 
 
@@ -299,14 +794,41 @@ def list_voices():
     return jsonify({"voices": voices, "default": DEFAULT_VOICE})
 
 
+def _index_response() -> Response:
+    """Serve index.html from memory, re-reading it only if it changed on disk.
+
+    Answers If-Modified-Since / If-None-Match with 304, as ``send_static_file`` did.
+    """
+    now = time.monotonic()
+    if not _index_cache["html"] or now - _index_cache["checked"] >= INDEX_RECHECK_SECONDS:  # type: ignore[operator]
+        _index_cache["checked"] = now
+        try:
+            mtime = INDEX_PATH.stat().st_mtime
+            if mtime != _index_cache["mtime"]:
+                html = INDEX_PATH.read_bytes()
+                _index_cache["html"] = html
+                _index_cache["mtime"] = mtime
+                _index_cache["etag"] = hashlib.blake2b(html, digest_size=16).hexdigest()
+        except OSError as exc:
+            app.logger.warning("Failed to read %s: %s", INDEX_PATH, exc)
+    if not _index_cache["html"]:
+        return Response("index.html not found", status=404, mimetype="text/plain")
+
+    response = Response(_index_cache["html"], mimetype="text/html")
+    response.headers["Cache-Control"] = "public, max-age=60"
+    response.last_modified = _index_cache["mtime"]  # type: ignore[assignment]
+    response.set_etag(_index_cache["etag"])  # type: ignore[arg-type]
+    return response.make_conditional(request)
+
+
 @app.route("/")
 def root():
-    return app.send_static_file("index.html")
+    return _index_response()
 
 
 @app.errorhandler(404)
 def not_found(_):
-    return app.send_static_file("index.html")
+    return _index_response()
 
 
 if __name__ == "__main__":
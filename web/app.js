@@ -2,6 +2,7 @@ const STORAGE_KEY = "lm_tts_chats_v1";
 const TEMP_KEY = "lm_tts_temperature";
 const VOICE_KEY = "lm_tts_voice";
 const MODEL_KEY = "lm_tts_selected_model";
+const WAV_HEADER_BYTES = 44;
 const DEFAULT_SYSTEM_PROMPT =
   "You are a helpful AI assistant who responds concisely and clearly. Keep answers friendly and readable.";
 
@@ -36,6 +37,7 @@ const state = {
 };
 
 let audioPlayer = null;
+let streamPlayer = null;
 
 document.addEventListener("DOMContentLoaded", init);
 
@@ -96,6 +98,7 @@ function bindEvents() {
     const last = chat.messages[chat.messages.length - 1];
     if (last.role !== "assistant") return;
     chat.messages.pop();
+    releaseAudioUrl(last.audioUrl);
     saveState();
     renderMessages();
     await requestAssistantResponse(chat);
@@ -451,11 +454,13 @@ async function speakAssistantMessage(messageId) {
       return;
     }
     setStatus("Generating speech…", false);
-    const audioUrl = await fetchTTS(message.content, selectedVoice);
+    const audioUrl = await streamTTS(message.content, selectedVoice);
+    if (!audioUrl) return;
+    const previousUrl = message.audioUrl;
     message.audioUrl = audioUrl;
+    releaseAudioUrl(previousUrl);
     message.voice = selectedVoice;
     saveState();
-    playAudio(audioUrl);
   } catch (error) {
     console.error(error);
     setStatus(error.message || "Failed to synthesize audio");
@@ -464,17 +469,156 @@ async function speakAssistantMessage(messageId) {
   }
 }
 
-async function fetchTTS(text, voice) {
+async function streamTTS(text, voice) {
   const response = await fetch("/api/tts", {
     method: "POST",
     headers: { "Content-Type": "application/json" },
     body: JSON.stringify({ text, voice }),
   });
-  const data = await response.json();
   if (!response.ok) {
+    const data = await response.json().catch(() => ({}));
     throw new Error(data.error || "TTS error");
   }
-  return `data:audio/wav;base64,${data.audio}`;
+
+  stopAudio(false);
+  const player = createStreamPlayer();
+  streamPlayer = player;
+  state.audioPlaying = true;
+  updateControls();
+
+  // Play chunks as they arrive and keep the bytes so replays can reuse them.
+  const reader = response.body.getReader();
+  const parts = [];
+  try {
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      if (streamPlayer !== player) {
+        reader.cancel();
+        return null;
+      }
+      parts.push(value);
+      player.push(value);
+    }
+  } catch (error) {
+    // The server aborts the stream when synthesis fails midway; never keep partial audio.
+    console.error(error);
+    stopAudio(false);
+    throw new Error("Speech synthesis was interrupted.");
+  }
+  player.finish();
+  return wavBlobUrl(parts);
+}
+
+function createStreamPlayer() {
+  const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+  const context = new AudioContextClass();
+  context.resume().catch(() => {});
+  const sources = new Set();
+  let header = new Uint8Array(0);
+  let sampleRate = null;
+  let carry = null;
+  let nextTime = 0;
+  let finished = false;
+  let closed = false;
+
+  const player = {
+    push(bytes) {
+      if (closed) return;
+      let data = bytes;
+      if (sampleRate === null) {
+        header = concatBytes([header, data]);
+        if (header.length < WAV_HEADER_BYTES) return;
+        sampleRate = new DataView(header.buffer, header.byteOffset, header.length).getUint32(24, true);
+        data = header.subarray(WAV_HEADER_BYTES);
+      }
+      if (carry) {
+        data = concatBytes([carry, data]);
+        carry = null;
+      }
+      if (data.length % 2) {
+        carry = data.slice(data.length - 1);
+        data = data.subarray(0, data.length - 1);
+      }
+      if (!data.length) return;
+
+      const view = new DataView(data.buffer, data.byteOffset, data.length);
+      const samples = new Float32Array(data.length / 2);
+      for (let i = 0; i < samples.length; i += 1) {
+        samples[i] = view.getInt16(i * 2, true) / 32768;
+      }
+      const buffer = context.createBuffer(1, samples.length, sampleRate);
+      buffer.copyToChannel(samples, 0);
+
+      const source = context.createBufferSource();
+      source.buffer = buffer;
+      source.connect(context.destination);
+      source.addEventListener("ended", () => {
+        sources.delete(source);
+        if (finished && !sources.size) handleStreamFinished(player);
+      });
+      nextTime = Math.max(nextTime, context.currentTime + 0.05);
+      source.start(nextTime);
+      nextTime += buffer.duration;
+      sources.add(source);
+    },
+    finish() {
+      finished = true;
+      if (!sources.size) handleStreamFinished(player);
+    },
+    stop() {
+      if (closed) return;
+      closed = true;
+      finished = true;
+      sources.forEach((source) => {
+        try {
+          source.stop();
+        } catch (error) {
+          // Already stopped.
+        }
+      });
+      sources.clear();
+      context.close().catch(() => {});
+    },
+  };
+  return player;
+}
+
+function handleStreamFinished(player) {
+  player.stop();
+  if (streamPlayer === player) {
+    streamPlayer = null;
+    state.audioPlaying = false;
+    updateControls();
+  }
+}
+
+function concatBytes(chunks) {
+  const total = chunks.reduce((sum, chunk) => sum + chunk.length, 0);
+  const out = new Uint8Array(total);
+  let offset = 0;
+  chunks.forEach((chunk) => {
+    out.set(chunk, offset);
+    offset += chunk.length;
+  });
+  return out;
+}
+
+function releaseAudioUrl(url) {
+  // Branched chats copy messages, so only revoke a blob no other message still uses.
+  if (!url || !url.startsWith("blob:")) return;
+  const inUse = state.chats.some((chat) => chat.messages.some((m) => m.audioUrl === url));
+  if (!inUse) URL.revokeObjectURL(url);
+}
+
+function wavBlobUrl(parts) {
+  // The streamed header leaves the sizes open; patch them so the blob is a regular WAV.
+  const bytes = concatBytes(parts);
+  if (bytes.length < WAV_HEADER_BYTES) return null;
+  const view = new DataView(bytes.buffer);
+  view.setUint32(4, bytes.length - 8, true);
+  view.setUint32(40, bytes.length - WAV_HEADER_BYTES, true);
+  return URL.createObjectURL(new Blob([bytes], { type: "audio/wav" }));
 }
 
 function playAudio(source) {
@@ -508,6 +652,10 @@ function playAudio(source) {
 }
 
 function stopAudio(showStatus = false) {
+  if (streamPlayer) {
+    streamPlayer.stop();
+    streamPlayer = null;
+  }
   if (audioPlayer) {
     audioPlayer.pause();
     audioPlayer.currentTime = 0;
@@ -590,7 +738,9 @@ function saveEditedMessage() {
   message.content = trimmed;
 
   if (message.role === "assistant") {
+    const previousUrl = message.audioUrl;
     delete message.audioUrl;
+    releaseAudioUrl(previousUrl);
     saveState();
     cancelEditingMessage();
     setStatus("Assistant message updated.", false);
@@ -598,7 +748,9 @@ function saveEditedMessage() {
   }
 
   if (message.role === "user") {
+    const removed = chat.messages.slice(index + 1);
     chat.messages = chat.messages.slice(0, index + 1);
+    removed.forEach((m) => releaseAudioUrl(m.audioUrl));
     saveState();
     cancelEditingMessage();
     requestAssistantResponse(chat);
@@ -652,7 +804,7 @@ function newId() {
 
 async function refreshModels() {
   try {
-    const response = await fetch("/api/models");
+    const response = await fetch("/api/models?refresh=1");
     const data = await response.json();
     state.models = data.models || [];
 